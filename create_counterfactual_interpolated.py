@@ -14,6 +14,19 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from fair_setup import write_csv
+
+def read_excel_cols(excel_file, usecols, **kwargs):
+    """
+    Read selected columns from the Excel workbook, via the calamine engine
+    when available and the default engine otherwise.
+    """
+    try:
+        return pd.read_excel(excel_file, header=None, usecols=usecols,
+                             engine="calamine", **kwargs)
+    except ImportError:
+        return pd.read_excel(excel_file, header=None, usecols=usecols, **kwargs)
+
 def create_counterfactual_interpolated():
     """
     Create counterfactual emissions file from interpolated emissions data.
@@ -25,15 +38,27 @@ def create_counterfactual_interpolated():
     
     # Read the Excel file - we need columns Z (Year), AA (Actual CO2), AC (Counterfactual CO2)
     # Note: Excel columns Z=26, AA=27, AC=29 (0-indexed: 25, 26, 28)
-    df_excel = pd.read_excel(excel_file, header=None)
-    
+    # First pass: read just the Year column (trivially cheap) to locate the
+    # 1976-2023 block, then read only that row range of the three columns
+    year_probe = pd.to_numeric(read_excel_cols(excel_file, [25]).iloc[:, 0],
+                               errors='coerce')
+    in_range = np.flatnonzero(((year_probe >= 1976) & (year_probe <= 2023)).to_numpy())
+    if in_range.size > 0:
+        first, last = in_range[0], in_range[-1]
+        df_excel = read_excel_cols(excel_file, [25, 26, 28],
+                                   skiprows=int(first),
+                                   nrows=int(last - first + 1))
+    else:
+        df_excel = read_excel_cols(excel_file, [25, 26, 28])
+
     # Extract the relevant columns
     # Column Z (26th column, 0-indexed: 25) = Year
     # Column AA (27th column, 0-indexed: 26) = Actual CO2 emissions (GtCO2/yr)
     # Column AC (29th column, 0-indexed: 28) = Counterfactual CO2 emissions (GtCO2/yr)
-    years = df_excel.iloc[:, 25]  # Column Z
-    actual_co2 = df_excel.iloc[:, 26]  # Column AA
-    counterfactual_co2 = df_excel.iloc[:, 28]  # Column AC
+    # With usecols the frame keeps only those three columns, in order
+    years = df_excel.iloc[:, 0]  # Column Z
+    actual_co2 = df_excel.iloc[:, 1]  # Column AA
+    counterfactual_co2 = df_excel.iloc[:, 2]  # Column AC
     
     # Convert to numeric values, handling any non-numeric data
     years = pd.to_numeric(years, errors='coerce')
@@ -62,10 +87,22 @@ def create_counterfactual_interpolated():
     
     print(f"Found adjustment data for {len(adjustment_data)} years (1976-2023)")
     
-    # Read the interpolated emissions file
+    # Read the interpolated emissions file, preferring the parquet copy
+    # written by interpolate_emissions.py over re-parsing the wide CSV —
+    # but only while the parquet is at least as new as the CSV, since
+    # interpolate_emissions.py skips the parquet write without pyarrow and
+    # a stale copy would silently shadow a regenerated CSV
     print("Reading interpolated emissions file...")
-    interpolated_file = "inputs/emissions_ssp245_interpolated.csv"
-    df_interpolated = pd.read_csv(interpolated_file)
+    interpolated_parquet = Path("inputs/emissions_ssp245_interpolated.parquet")
+    interpolated_file = Path("inputs/emissions_ssp245_interpolated.csv")
+    if interpolated_parquet.exists() and (
+            not interpolated_file.exists()
+            or interpolated_parquet.stat().st_mtime >= interpolated_file.stat().st_mtime):
+        print(f"  Reading {interpolated_parquet}")
+        df_interpolated = pd.read_parquet(interpolated_parquet)
+    else:
+        print(f"  Reading {interpolated_file}")
+        df_interpolated = pd.read_csv(interpolated_file)
     
     # Find the CO2 emissions row (should be "Emissions|CO2")
     co2_row = df_interpolated[df_interpolated['Variable'] == 'Emissions|CO2'].copy()
@@ -78,23 +115,38 @@ def create_counterfactual_interpolated():
     # Create a copy of the interpolated file for modification
     df_counterfactual = df_interpolated.copy()
     
-    # Apply adjustments to CO2 emissions for years 1976-2023
+    # Apply adjustments to CO2 emissions for years 1976-2023 on a NumPy view
+    # of the year-column block: map years to integer column offsets once, add
+    # the whole adjustment vector, and write the block back in one shot, with
+    # no per-year string-keyed column lookups
     print("Applying CO2 emissions adjustments...")
-    for _, row in adjustment_data.iterrows():
-        year = int(row['Year'])
-        adjustment = row['Adjustment_Mt']
-        
-        # Find the CO2 row and apply the adjustment
-        mask = df_counterfactual['Variable'] == 'Emissions|CO2'
-        if str(year) in df_counterfactual.columns:
-            df_counterfactual.loc[mask, str(year)] += adjustment
-            print(f"  Year {year}: Added {adjustment:.1f} MtCO2/yr")
-        else:
-            print(f"  Warning: Year {year} not found in interpolated emissions file")
+    year_index = pd.Index([c for c in df_counterfactual.columns if c.isdigit()])
+    # copy=True: to_numpy() may hand back a read-only view under
+    # copy-on-write, and the block is mutated in place below
+    block = df_counterfactual[year_index.tolist()].to_numpy(copy=True)
+
+    co2_pos = int(np.flatnonzero(
+        (df_counterfactual['Variable'] == 'Emissions|CO2').to_numpy())[0])
+
+    # One bulk hashed lookup of all adjustment years against the year
+    # columns; missing years come back as -1
+    wanted = adjustment_data['Year'].astype(int).astype(str).to_numpy()
+    col_idx = year_index.get_indexer(wanted)
+    present = col_idx >= 0
+    if not present.all():
+        missing = wanted[~present].tolist()
+        print(f"  Warning: Years {missing} not found in interpolated emissions file")
+
+    adjustments = adjustment_data['Adjustment_Mt'].to_numpy()
+    block[co2_pos, col_idx[present]] += adjustments[present]
+    df_counterfactual.loc[:, year_index.tolist()] = block
+
+    print(f"  Adjusted {int(present.sum())} years "
+          f"(total {adjustments[present].sum():.1f} MtCO2)")
     
     # Save the modified emissions file
     output_file = "inputs/emissions_ssp245_interpolated_counterfactual_1975.csv"
-    df_counterfactual.to_csv(output_file, index=False)
+    write_csv(df_counterfactual, output_file)
     print(f"\nSaved counterfactual interpolated emissions file: {output_file}")
     
     # Print summary statistics
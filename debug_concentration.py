@@ -7,15 +7,23 @@ import numpy as np
 from fair import FAIR
 from fair.interface import initialise
 
+# Define species list
+simple_species = ['CO2', 'CH4', 'N2O', 'Sulfur', 'BC', 'OC']
+
 # Initialize FAIR
+# The concentration-initialization behaviour we are debugging only needs a
+# handful of timesteps and the species under test, so keep the allocation
+# small instead of the full 1750-2023 kitchen sink
 f = FAIR()
-f.define_time(1750, 2023, 1)
+f.define_time(1750, 1760, 1)
 f.define_scenarios(['test'])
 f.define_configs(['default'])
 
-# Load species properties
+# Load species properties, restricted to the species being debugged
 from fair.io import read_properties
 species, props = read_properties()
+species = [s for s in species if s in simple_species]
+props = {k: v for k, v in props.items() if k in simple_species}
 f.define_species(species, props)
 f.allocate()
 f.fill_species_configs()
@@ -26,20 +34,12 @@ initialise(f.climate_configs['ocean_heat_transfer'], [0.73, 0.70, 0.70])
 initialise(f.climate_configs['deep_ocean_efficacy'], 1.28)
 initialise(f.climate_configs['forcing_4co2'], 7.32)
 
-# Initialize other arrays
-initialise(f.forcing, 0)
-initialise(f.temperature, 0)
-initialise(f.cumulative_emissions, 0)
-initialise(f.airborne_emissions, 0)
-
-# Set all values to zero
-f.temperature.values[:] = 0.0
-f.forcing.values[:] = 0.0
-f.cumulative_emissions.values[:] = 0.0
-f.airborne_emissions.values[:] = 0.0
-
-# Define species list
-simple_species = ['CO2', 'CH4', 'N2O', 'Sulfur', 'BC', 'OC']
+# Set all values to zero; ndarray.fill is a single memset-style pass, and the
+# full fill already covers what initialise(..., 0) would write
+f.temperature.values.fill(0.0)
+f.forcing.values.fill(0.0)
+f.cumulative_emissions.values.fill(0.0)
+f.airborne_emissions.values.fill(0.0)
 
 print("Available species in baseline_concentration:", list(f.species_configs['baseline_concentration'].specie.values))
 print("CH4 in baseline_concentration:", 'CH4' in f.species_configs['baseline_concentration'].specie.values)
@@ -48,24 +48,29 @@ print("\nBefore concentration initialization:")
 print("CH4 concentration (first 5):", f.concentration.sel(specie='CH4').values.flatten()[:5])
 print("Any NaN in CH4:", np.isnan(f.concentration.sel(specie='CH4').values).any())
 
-# Try to initialize concentrations
-for species in simple_species:
-    print(f"\nProcessing {species}...")
-    if species in f.species_configs['baseline_concentration'].specie.values:
-        baseline_value = f.species_configs['baseline_concentration'].sel(specie=species).values
-        print(f"  Baseline value: {baseline_value}")
-        if not np.isnan(baseline_value):
-            print(f"  Setting all timepoints to {baseline_value}")
-            f.concentration.sel(specie=species).values[:] = baseline_value
-            if species == 'CH4':
-                print(f"  CH4 concentration after setting (first 5): {f.concentration.sel(specie='CH4').values.flatten()[:5]}")
-        else:
-            print(f"  Baseline value is NaN, using default")
-            if species == 'CH4':
-                f.concentration.sel(specie=species).values[:] = 729.2
-                print(f"  Set CH4 to 729.2")
-    else:
-        print(f"  Species not in baseline_concentration")
+# Initialize concentrations with one fancy-index assignment instead of a
+# per-species .sel(...).values[:] = ... loop: gather the baseline values for
+# all species present, patch NaN baselines with defaults, and broadcast the
+# vector across the specie axis in a single write
+available = list(f.species_configs['baseline_concentration'].specie.values)
+present = [s for s in simple_species if s in available]
+missing = [s for s in simple_species if s not in available]
+if missing:
+    print(f"\nSpecies not in baseline_concentration: {missing}")
+
+idx = [list(f.concentration.specie.values).index(s) for s in present]
+baselines = f.species_configs['baseline_concentration'].sel(specie=present).values.astype(np.float64).ravel()
+print("\nBaseline values:", dict(zip(present, baselines)))
+
+# NaN baselines fall back to known pre-industrial defaults, applied with a
+# single masked write over the gathered vector (no per-species branching)
+PREINDUSTRIAL_DEFAULTS = {'CO2': 278.3, 'CH4': 729.2, 'N2O': 270.1}
+defaults = np.array([PREINDUSTRIAL_DEFAULTS.get(s, np.nan) for s in present])
+fill_values = baselines.copy()
+mask = np.isnan(fill_values)
+fill_values[mask] = defaults[mask]
+
+f.concentration.values[..., idx] = fill_values
 
 print("\nAfter concentration initialization:")
 print("CH4 concentration (first 5):", f.concentration.sel(specie='CH4').values.flatten()[:5])
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Optional JIT-compiled emissions-to-temperature core for the comparison script.
+
+The full FAIR integrator carries ~60 species through pure-Python/xarray math
+each timestep. For this comparison only a small self-contained system matters:
+CO2 (4 impulse-response boxes), CH4 and N2O (single-lifetime decay), a linear
+aerosol forcing from Sulfur/BC/OC, and a 3-layer ocean — about 10 ODE state
+variables integrated over 273 annual steps. integrate() implements that system
+as a tight scalar loop that numba compiles to machine code, with prange over
+the scenario axis so both scenarios run in parallel threads.
+
+This is an approximation of FAIR, not a replacement: it drops the minor
+species and the CH4 lifetime feedbacks, so it is opt-in only (set
+FAIR_FAST_CORE=1 for run_fair_comparison_proper.py) and intended for quick
+iteration where second-order accuracy is acceptable.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        # Plain-Python fallback so the module stays importable without numba
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+# Species order expected along the last axis of the emissions array
+SPECIES_ORDER = ['CO2 FFI', 'CH4', 'N2O', 'Sulfur', 'BC', 'OC']
+
+# Pre-industrial concentrations (ppm / ppb / ppb)
+CO2_PI = 278.3
+CH4_PI = 729.2
+N2O_PI = 270.1
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def integrate(emissions, ocean_hc, ocean_ht, deep_eff, f4co2):
+    """
+    Integrate the reduced climate system for every scenario in parallel.
+
+    Parameters
+    ----------
+    emissions : (n_timepoints, n_scenarios, 6) float64 ndarray
+        Annual emissions in SPECIES_ORDER units: GtCO2/yr for CO2 FFI,
+        MtCH4/yr, MtN2O/yr, MtSO2/yr, Mt/yr BC, Mt/yr OC.
+    ocean_hc : (3,) float64 ndarray
+        Heat capacities of the three ocean layers (W yr m-2 K-1).
+    ocean_ht : (3,) float64 ndarray
+        Climate feedback (layer 0) and inter-layer heat transfer
+        coefficients (W m-2 K-1).
+    deep_eff : float
+        Deep-ocean heat uptake efficacy.
+    f4co2 : float
+        Forcing for a quadrupling of CO2 (W m-2); halved to get F2x.
+
+    Returns
+    -------
+    temp : (n_timepoints + 1, n_scenarios, 3) ndarray
+        Layer temperatures on timebounds (K above pre-industrial).
+    conc : (n_timepoints + 1, n_scenarios, 3) ndarray
+        CO2 (ppm), CH4 (ppb), N2O (ppb) concentrations on timebounds.
+    """
+    n_t = emissions.shape[0]
+    n_scen = emissions.shape[1]
+
+    temp = np.zeros((n_t + 1, n_scen, 3))
+    conc = np.zeros((n_t + 1, n_scen, 3))
+
+    # Joos et al. (2013) 4-box impulse response for CO2 (fractions/timescales)
+    a0, a1, a2, a3 = 0.2173, 0.2240, 0.2824, 0.2763
+    tau1, tau2, tau3 = 394.4, 36.54, 4.304
+    gtc_per_ppm = 2.124          # airborne GtC per ppm CO2
+    gtc_per_gtco2 = 12.0 / 44.0  # molecular weight ratio
+
+    # Single-lifetime gas cycles (no temperature feedback in this core)
+    ch4_tau = 11.8    # yr
+    ch4_per_ppb = 2.75   # MtCH4 per ppb
+    n2o_tau = 109.0   # yr
+    n2o_per_ppb = 7.8    # MtN2O per ppb
+
+    # Myhre et al. (1998) simplified forcing coefficients
+    f2x = f4co2 / 2.0
+    ch4_rf = 0.036    # W m-2 per sqrt(ppb)
+    n2o_rf = 0.12     # W m-2 per sqrt(ppb)
+
+    # Linear aerosol forcing per Mt of precursor (ERFari+aci, roughly tuned
+    # to present-day aerosol ERF of about -1 W m-2)
+    so2_rf = -0.0036
+    bc_rf = 0.0508
+    oc_rf = -0.0062
+
+    lam = ocean_ht[0]
+    kappa1 = ocean_ht[1]
+    kappa2 = ocean_ht[2]
+    c1, c2, c3 = ocean_hc[0], ocean_hc[1], ocean_hc[2]
+
+    for s in prange(n_scen):
+        # CO2 impulse-response boxes (GtC above pre-industrial)
+        b0 = 0.0
+        b1 = 0.0
+        b2 = 0.0
+        b3 = 0.0
+        ch4 = CH4_PI
+        n2o = N2O_PI
+        t1 = 0.0
+        t2 = 0.0
+        t3 = 0.0
+
+        conc[0, s, 0] = CO2_PI
+        conc[0, s, 1] = CH4_PI
+        conc[0, s, 2] = N2O_PI
+
+        for t in range(n_t):
+            # --- gas cycles (annual Euler step) ---
+            e_gtc = emissions[t, s, 0] * gtc_per_gtco2
+            b0 = b0 + a0 * e_gtc
+            b1 = b1 * np.exp(-1.0 / tau1) + a1 * e_gtc
+            b2 = b2 * np.exp(-1.0 / tau2) + a2 * e_gtc
+            b3 = b3 * np.exp(-1.0 / tau3) + a3 * e_gtc
+            co2 = CO2_PI + (b0 + b1 + b2 + b3) / gtc_per_ppm
+
+            ch4 = ch4 + emissions[t, s, 1] / ch4_per_ppb - (ch4 - CH4_PI) / ch4_tau
+            n2o = n2o + emissions[t, s, 2] / n2o_per_ppb - (n2o - N2O_PI) / n2o_tau
+
+            # --- forcing ---
+            forc = f2x * np.log(co2 / CO2_PI) / np.log(2.0)
+            forc += ch4_rf * (np.sqrt(ch4) - np.sqrt(CH4_PI))
+            forc += n2o_rf * (np.sqrt(n2o) - np.sqrt(N2O_PI))
+            forc += (so2_rf * emissions[t, s, 3]
+                     + bc_rf * emissions[t, s, 4]
+                     + oc_rf * emissions[t, s, 5])
+
+            # --- 3-layer ocean energy balance (annual Euler step) ---
+            dt1 = (forc - lam * t1 - kappa1 * (t1 - t2)) / c1
+            dt2 = (kappa1 * (t1 - t2) - deep_eff * kappa2 * (t2 - t3)) / c2
+            dt3 = deep_eff * kappa2 * (t2 - t3) / c3
+            t1 += dt1
+            t2 += dt2
+            t3 += dt3
+
+            conc[t + 1, s, 0] = co2
+            conc[t + 1, s, 1] = ch4
+            conc[t + 1, s, 2] = n2o
+            temp[t + 1, s, 0] = t1
+            temp[t + 1, s, 1] = t2
+            temp[t + 1, s, 2] = t3
+
+    return temp, conc
+
+
+@njit(cache=True)
+def find_bad_log_args(temp, sens):
+    """
+    Scan a temperature array for entries whose CH4-lifetime log argument
+    (1 + T * sensitivity) would be NaN or non-positive.
+
+    Returns a boolean mask over the flattened array; np.flatnonzero on the
+    result lists the offending flat indices.
+    """
+    flat = temp.ravel()
+    out = np.empty(flat.size, np.bool_)
+    for i in range(flat.size):
+        v = flat[i]
+        out[i] = np.isnan(v) or (1.0 + v * sens) <= 0.0
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def diff_and_reduce(base, cf):
+    """
+    Fused counterfactual-minus-baseline differences and reductions.
+
+    Takes two (n_series, n_timebounds) blocks of stacked series and, in one
+    pass per series, writes the difference row while accumulating its
+    running maximum and (for the last row, emissions) the running sum — no
+    temporaries between the subtraction and the reductions.
+
+    Returns
+    -------
+    diff : (n_series, n_timebounds) ndarray
+    maxes : (n_series,) ndarray of per-series maxima
+    last_row_sum : float, sum of the final difference row
+    """
+    n_series = base.shape[0]
+    n_t = base.shape[1]
+    diff = np.empty((n_series, n_t))
+    maxes = np.empty(n_series)
+    last_row_sum = 0.0
+    for i in range(n_series):
+        row_max = -np.inf
+        for t in range(n_t):
+            d = cf[i, t] - base[i, t]
+            diff[i, t] = d
+            if d > row_max:
+                row_max = d
+            if i == n_series - 1:
+                last_row_sum += d
+        maxes[i] = row_max
+    return diff, maxes, last_row_sum
@@ -11,85 +11,176 @@ This script:
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from scipy.interpolate import interp1d
+
+from fair_setup import write_csv
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _interp_all(xp, fp_mat, known_mat, x_out, out):
+        """
+        Interpolate every row of fp_mat onto x_out in parallel, compacting
+        each row's known values (known_mat) before calling np.interp.
+        """
+        for i in prange(fp_mat.shape[0]):
+            k = 0
+            xk = np.empty(fp_mat.shape[1])
+            fk = np.empty(fp_mat.shape[1])
+            for j in range(fp_mat.shape[1]):
+                if known_mat[i, j]:
+                    xk[k] = xp[j]
+                    fk[k] = fp_mat[i, j]
+                    k += 1
+            if k >= 2:
+                out[i] = np.interp(x_out, xk[:k], fk[:k])
+            elif k == 1:
+                out[i] = fk[0]
+            else:
+                out[i] = 0.0
+
+def _uniform_columns(nan_mask, years_arr, full_year_range):
+    """
+    True when every year column is either fully reported or fully missing
+    across rows, with at least two known years bracketing the target range,
+    so a single shared-axis interpolation is valid for all rows.
+    """
+    col_nan_counts = nan_mask.sum(axis=0)
+    n_rows = nan_mask.shape[0]
+    if not np.all((col_nan_counts == 0) | (col_nan_counts == n_rows)):
+        return False
+    known_years = years_arr[col_nan_counts == 0]
+    return (known_years.size >= 2
+            and known_years[0] <= full_year_range[0]
+            and known_years[-1] >= full_year_range[-1])
 
 def interpolate_emissions():
     """
     Interpolate emissions data to fill in all years from 1750-2023.
     """
-    
+
     print("Reading baseline emissions file...")
-    baseline_file = "inputs/emissions_ssp245.csv"
-    df_baseline = pd.read_csv(baseline_file)
-    
+    # Prefer the parquet copy written by fair_ssp_csv.py (columnar, no CSV
+    # re-parse), but only while it is at least as new as the CSV — a
+    # regenerated CSV must not be shadowed by a stale parquet from an
+    # earlier run (e.g. when pyarrow was missing and no fresh copy was
+    # written)
+    baseline_parquet = Path("inputs/emissions_ssp245.parquet")
+    baseline_file = Path("inputs/emissions_ssp245.csv")
+    if baseline_parquet.exists() and (
+            not baseline_file.exists()
+            or baseline_parquet.stat().st_mtime >= baseline_file.stat().st_mtime):
+        print(f"  Reading {baseline_parquet}")
+        df_baseline = pd.read_parquet(baseline_parquet)
+    else:
+        print(f"  Reading {baseline_file}")
+        df_baseline = pd.read_csv(baseline_file)
+
     print(f"Original file has {len(df_baseline)} rows")
-    
+
     # Get the metadata columns (Scenario, Variable, Unit)
     metadata_cols = ['Scenario', 'Variable', 'Unit']
-    
+
     # Get the year columns (all columns that are numeric)
     year_cols = [col for col in df_baseline.columns if col not in metadata_cols]
     year_cols = sorted([int(col) for col in year_cols if col.isdigit()])
-    
+
     print(f"Available years: {min(year_cols)} to {max(year_cols)}")
     print(f"Number of available years: {len(year_cols)}")
-    
+
     # Create the full range of years we want (1750-2023)
-    full_year_range = list(range(1750, 2024))  # 2024 to include 2023
-    print(f"Target years: {min(full_year_range)} to {max(full_year_range)}")
+    full_year_range = np.arange(1750, 2024)  # 2024 to include 2023
+    print(f"Target years: {full_year_range.min()} to {full_year_range.max()}")
     print(f"Number of target years: {len(full_year_range)}")
-    
-    # Create a more efficient approach to avoid DataFrame fragmentation
+
     print("Interpolating emissions data...")
-    
-    # Pre-allocate the interpolated data as a list of dictionaries
-    interpolated_data = []
-    
-    for idx, row in df_baseline.iterrows():
-        # Get the available values for this emission type
-        available_values = []
-        available_years = []
-        
-        for year in year_cols:
-            value = row[str(year)]
-            if pd.notna(value):  # Only include non-NaN values
-                available_values.append(value)
-                available_years.append(year)
-        
-        # Create the row data dictionary
-        row_data = {
-            'Scenario': row['Scenario'],
-            'Variable': row['Variable'],
-            'Unit': row['Unit']
-        }
-        
-        if len(available_values) < 2:
-            print(f"Warning: Row {idx} ({row['Variable']}) has insufficient data for interpolation")
-            # Fill with zeros or the single available value
-            default_value = available_values[0] if available_values else 0
-            for year in full_year_range:
-                row_data[str(year)] = default_value
-        else:
-            # Perform linear interpolation
-            interpolated_values = np.interp(full_year_range, available_years, available_values)
-            for year, value in zip(full_year_range, interpolated_values):
-                row_data[str(year)] = value
-        
-        interpolated_data.append(row_data)
-    
-    # Create the DataFrame from the list of dictionaries (much more efficient)
-    df_interpolated = pd.DataFrame(interpolated_data)
-    
+
+    # Pull all year columns out as one contiguous (rows, years) block so the
+    # interpolation runs on NumPy arrays instead of per-cell pandas lookups.
+    # float32 is plenty for emissions known to ~4 significant figures and
+    # halves the memory traffic through interpolation and the CSV write
+    year_strs = [str(y) for y in year_cols]
+    arr = df_baseline[year_strs].to_numpy(dtype=np.float32)
+    years_arr = np.asarray(year_cols, dtype=np.float64)
+
+    out = np.empty((len(df_baseline), full_year_range.size), dtype=np.float32)
+
+    nan_mask = np.isnan(arr)
+
+    # Warn about rows that cannot be interpolated (the kernels fall back to
+    # the single available value, or zero)
+    known_counts = (~nan_mask).sum(axis=1)
+    for idx in np.flatnonzero(known_counts < 2):
+        variable = df_baseline.iloc[idx]['Variable']
+        print(f"Warning: Row {idx} ({variable}) has insufficient data for interpolation")
+
+    if njit is not None:
+        # Rows are independent, so let numba interpolate them across cores
+        _interp_all(years_arr, arr.astype(np.float64), ~nan_mask,
+                    full_year_range.astype(np.float64), out)
+    elif _uniform_columns(nan_mask, years_arr, full_year_range):
+        # Common case: every year column is either fully reported or fully
+        # missing (the shared RCMIP reporting grid), so the available years
+        # can be computed once and all rows interpolated in a single
+        # interp1d call along axis 1
+        known = np.flatnonzero(~nan_mask[0])
+        out[:] = interp1d(years_arr[known], arr[:, known], axis=1,
+                          assume_sorted=True)(full_year_range)
+    else:
+        # NumPy fallback: group rows by their NaN mask and interpolate each
+        # group against a shared known-years axis
+        unique_masks, inverse = np.unique(nan_mask, axis=0, return_inverse=True)
+
+        for g, mask in enumerate(unique_masks):
+            rows = np.flatnonzero(inverse == g)
+            known = np.flatnonzero(~mask)
+            known_years = years_arr[known]
+            known_vals = arr[np.ix_(rows, known)]
+
+            if known_years.size < 2:
+                # Fill with zeros or the single available value
+                if known_years.size == 1:
+                    out[rows] = known_vals[:, [0]]
+                else:
+                    out[rows] = 0.0
+            else:
+                # Perform linear interpolation for every row in the group
+                out[rows] = np.stack([
+                    np.interp(full_year_range, known_years, vals)
+                    for vals in known_vals
+                ])
+
+    # Assemble the interpolated frame column-oriented: wrap the contiguous
+    # interpolation matrix directly and concatenate the metadata columns,
+    # keeping the float64 block in one piece for the CSV write
+    df_years = pd.DataFrame(out, columns=[str(y) for y in full_year_range])
+    df_interpolated = pd.concat(
+        [df_baseline[metadata_cols].reset_index(drop=True), df_years], axis=1
+    )
+
     # Save the interpolated emissions file
     output_file = "inputs/emissions_ssp245_interpolated.csv"
-    df_interpolated.to_csv(output_file, index=False)
+    write_csv(df_interpolated, output_file)
     print(f"\nSaved interpolated emissions file: {output_file}")
-    
+
+    # Parquet copy for the counterfactual script, which only needs to touch
+    # the CO2 row and a subset of year columns
+    try:
+        df_interpolated.to_parquet("inputs/emissions_ssp245_interpolated.parquet",
+                                   compression="zstd")
+    except ImportError:
+        pass
+
     # Print some statistics
     print(f"\nInterpolation summary:")
     print(f"Original years: {len(year_cols)}")
     print(f"Interpolated years: {len(full_year_range)}")
     print(f"Added {len(full_year_range) - len(year_cols)} years through interpolation")
-    
+
     return output_file
 
 if __name__ == "__main__":
@@ -4,9 +4,10 @@ Test proper FAIR initialization following the example in fair_ssp.py
 """
 
 from fair import FAIR
-from fair.io import read_properties
 from fair.interface import fill, initialise
 
+import fair_setup
+
 print("Testing proper FAIR initialization...")
 
 # 1) Model & horizon
@@ -16,7 +17,7 @@ f.define_scenarios(['ssp245'])
 f.define_configs(['default'])  # Add config definition
 
 # 2) Species & properties (defaults OK for an emissions-driven run)
-species, props = read_properties()          # default "kitchen sink"
+species, props = fair_setup.cached_read_properties()  # default "kitchen sink"
 f.define_species(species, props)
 f.allocate()
 
@@ -30,15 +31,9 @@ f.fill_from_rcmip()  # <- key step
 
 # 5) Initialise state & run
 print("Initializing state...")
-# Initialize climate configs with default values
-initialise(f.climate_configs['ocean_heat_capacity'], [2.92, 11.28, 73.25])
-initialise(f.climate_configs['ocean_heat_transfer'], [0.73, 0.70, 0.70])
-initialise(f.climate_configs['deep_ocean_efficacy'], 1.28)
-initialise(f.climate_configs['forcing_4co2'], 7.32)
-
+# Climate configs and state zeroing via the shared helper
+fair_setup.init_state(f)
 initialise(f.concentration, f.species_configs['baseline_concentration'])
-initialise(f.forcing, 0); initialise(f.temperature, 0)
-initialise(f.cumulative_emissions, 0); initialise(f.airborne_emissions, 0)
 
 print("Running FAIR...")
 f.run()